@@ -1,365 +1,641 @@
-# Smart Home System
-from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Callable, List
-from tqdm import tqdm
-import time
-
-
-# HERANÇA – Classe base para todos os dispositivos
-
-class Device(ABC):
-    @abstractmethod
-    def turn_on(self):
-        pass
-
-    @abstractmethod
-    def turn_off(self):
-        pass
- 
-    @abstractmethod
-    def status(self) -> str:
-        pass
-
-
-
-# FACTORY – Criação de dispositivos de forma padronizada
-
-class Light(Device):
-    def __init__(self):
-        self._on = False
-
-    def turn_on(self):
-        self._on = True
-
-    def turn_off(self):
-        self._on = False
-
-    def status(self) -> str:
-        return "Luz: LIGADA" if self._on else "Luz: DESLIGADA"
-
-
-class Camera(Device):
-    def __init__(self):
-        self._recording = False
-
-    def turn_on(self):
-        self._recording = True
-
-    def turn_off(self):
-        self._recording = False
-
-    def status(self) -> str:
-        return "Câmera: Gravação" if self._recording else "Câmera: DESLIGADA"
-
-
-class MotionSensor(Device):
-    def __init__(self):
-        self._active = False
-
-    def turn_on(self):
-        self._active = True
-
-    def turn_off(self):
-        self._active = False
-
-    def status(self) -> str:
-        return "Sensor de Movimento: Ativo" if self._active else "Sensor de movimento: DESLIGADO"
-
-
-# Factory que cria objetos automaticamente
-class DeviceFactory:
-    @staticmethod
-    def create(device_type: str) -> Device:
-        mapping = {
-            "light": Light,
-            "camera": Camera,
-            "sensor": MotionSensor
-        }
-
-        if device_type not in mapping:
-            raise ValueError(f"Tipo desconhecido: {device_type}")
-
-        return mapping[device_type]()
-
-
-# OBSERVER – Notificações enviadas para vários observadores
-# Ele permite que vários objetos recebam notificações quando algo acontece no sistema
-
-class Observer(ABC):
-    @abstractmethod
-    def update(self, event: str):
-        pass
-
-
-class UserApp(Observer):
-    def __init__(self, name):
-        self.name = name
-
-    def update(self, event: str):
-        print(f"{self.name} - APP received notification: {event}")
-
-
-class Notifier:
-    def __init__(self):
-        self._observers: List[Observer] = []
-
-    def register(self, observer: Observer):
-        self._observers.append(observer)
-
-    def remove(self, observer: Observer):
-        self._observers.remove(observer)
-
-    def notify(self, event: str):
-        for observer in list(self._observers):
-            observer.update(event)
-
-
-
-# STRATEGY – Modos de operação diferentes
-
-class OperationMode(ABC):
-    @abstractmethod
-    def apply(self, devices: List[Device]):
-        pass
-
-
-class EcoMode(OperationMode):
-    def apply(self, devices: List[Device]):
-        for device in devices: 
-            try:
-                device.turn_off()
-            except Exception:
-                pass
-
-
-class ComfortMode(OperationMode):
-    def apply(self, devices: List[Device]):
-        for device in devices:
-            try:
-                device.turn_on()
-            except Exception:
-                pass
-
-
-class SecurityMode(OperationMode):
-    def apply(self, devices: List[Device]):
-        for device in devices:
-            if isinstance(device, (MotionSensor, Camera)):
-                device.turn_on()
-            elif isinstance(device, Light):
-                device.turn_off()
-
-
-# Construção de rotinas passo a passo
-
-class Routine:
-    def __init__(self, name: str, actions: List[Callable]):
-        self.name = name
-        self.actions = actions
-
-    def execute(self):
-        for action in self.actions:
-            action()
-
-
-class RoutineBuilder:
-    def __init__(self):
-        self.name = "Routine"
-        self.actions = []
-
-    def with_name(self, name: str):
-        self.name = name
-        return self
-
-    def add_action(self, action: Callable):
-        self.actions.append(action)
-        return self
-
-    def build(self) -> Routine:
-        return Routine(self.name, self.actions)
-
-
-# FACADE – Interface simples para controlar o sistema
-
-class SmartHomeFacade:
-    def __init__(self, controller):
-        self._controller = controller
-
-    def activate_security_mode(self):
-        self._controller.set_mode(SecurityMode())
-
-    def activate_comfort_mode(self):
-        self._controller.set_mode(ComfortMode())
-
-    def execute_routine(self, routine: Routine):
-        routine.execute()
-
-    def turn_on_device(self, device: Device):
-        self._controller.execute_command(TurnOnCommand(device))
-
-    def turn_off_device(self, device: Device):
-        self._controller.execute_command(TurnOffCommand(device))
-
-
-
-#  Adiciona funcionalidades sem alterar a classe base
-
-class DeviceDecorator(Device):
-    def __init__(self, device: Device):
-        self._device = device
-
-    def turn_on(self):
-        self._device.turn_on()
-
-    def turn_off(self):
-        self._device.turn_off()
-
-    def status(self):
-        return self._device.status()
-
-
-class RemoteMonitoringDecorator(DeviceDecorator):
-    def __init__(self, device: Device, notifier: Notifier):
-        super().__init__(device)
-        self._notifier = notifier
-
-    def turn_on(self):
-        super().turn_on()
-        self._notifier.notify(
-            f"{self._device.__class__.__name__} remotely turned ON"
-        )
-
-    def turn_off(self):
-        super().turn_off()
-        self._notifier.notify(
-            f"{self._device.__class__.__name__} remotely turned OFF"
-        )
-
-
-
-#Executar e desfazer ações
-
-class Command(ABC):
-    @abstractmethod
-    def execute(self):
-        pass
-
-    @abstractmethod
-    def undo(self):
-        pass
-
-
-class TurnOnCommand(Command):
-    def __init__(self, device: Device):
-        self._device = device
-
-    def execute(self):
-        self._device.turn_on()
-
-    def undo(self):
-        self._device.turn_off()
-
-
-class TurnOffCommand(Command):
-    def __init__(self, device: Device):
-        self._device = device
-
-    def execute(self):
-        self._device.turn_off()
-
-    def undo(self):
-        self._device.turn_on()
-
-
-# SINGLETON + DEPENDENCY INJECTION – Controlador central
-
-class CentralController:
-    _instance = None
-
-    def __new__(cls, notifier=None):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-
-    def __init__(self, notifier=None):
-        if not hasattr(self, "_initialized"):
-            self._devices = []
-            self._history = []
-            self._mode = None
-            self._notifier = notifier or Notifier()
-            self._initialized = True
-
-    def add_device(self, device: Device):
-        self._devices.append(device)
-        self._notifier.notify(f"Device added: {device.__class__.__name__}")
-
-    def execute_command(self, command: Command):
-        command.execute()
-        self._history.append(command)
-        self._notifier.notify(f"Command executed: {command.__class__.__name__} at {datetime.now()}")
-
-    def undo_last(self):
-        if not self._history:
-            return
-        cmd = self._history.pop()
-        cmd.undo()
-        self._notifier.notify(f"Command undone: {cmd.__class__.__name__} at {datetime.now()}")
-
-    def set_mode(self, mode: OperationMode):
-        self._mode = mode
-        if mode:
-            mode.apply(self._devices)
-            self._notifier.notify(f"Mode set: {mode.__class__.__name__}")
-
-
-
-
-if __name__ == "__main__":
-    notifier = Notifier()
-    app = UserApp("Otavio")
-    notifier.register(app)
-
-    controller = CentralController(notifier=notifier)
-
-    l1 = DeviceFactory.create("light")
-    c1 = DeviceFactory.create("camera")
-    s1 = DeviceFactory.create("sensor")
-
-
-
-
-    for device in [l1, c1, s1,]:
-        controller.add_device(device)
-
-    facade = SmartHomeFacade(controller)
-
-    facade.activate_security_mode()
-
-
-    for device in controller._devices:
-        print(device.status())
-
-    for tempo in tqdm(range(5)):
-        time.sleep(0.5)
-
-    routine = (
-        RoutineBuilder()
-        .with_name("Boa noite")
-        .add_action(lambda: facade.turn_off_device(l1))
-        .add_action(lambda: facade.activate_comfort_mode())
-        .build()
-    )
-
-    facade.execute_routine(routine)
-
-    for device in controller._devices:
-        print(device.status())
-
-    for tempo in tqdm(range(5)):
-        time.sleep(0.5)
-
-    controller.undo_last()
-
-
-    print("Fim")
+# Smart Home System
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, List
+from tqdm import tqdm
+from numba import njit, prange
+import asyncio
+import logging
+import numpy as np
+import threading
+import time
+
+# Logger com saída bufferizada no lugar de print() a cada evento
+logger = logging.getLogger("smarthome")
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.INFO)
+
+
+# HERANÇA – Classe base para todos os dispositivos
+
+class Device(ABC):
+    __slots__ = ()
+
+    # Cacheia o nome da classe uma vez: evita __class__.__name__ no caminho quente
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._NAME = cls.__name__
+
+    @abstractmethod
+    def turn_on(self):
+        pass
+
+    @abstractmethod
+    def turn_off(self):
+        pass
+ 
+    @abstractmethod
+    def status(self) -> str:
+        pass
+
+    # Ação padrão no modo segurança: desligar (sensores e câmeras sobrescrevem)
+    def security_action(self):
+        self.turn_off()
+
+    # Versões async: dispositivos locais só viram o estado, mas adaptadores
+    # de rede podem sobrescrever com await de verdade (ex: API do fabricante)
+    async def turn_on_async(self):
+        self.turn_on()
+
+    async def turn_off_async(self):
+        self.turn_off()
+
+    async def security_action_async(self):
+        self.security_action()
+
+
+
+# FACTORY – Criação de dispositivos de forma padronizada
+
+class Light(Device):
+    __slots__ = ("_on",)
+    # Só existem 2 status possíveis: pré-calcular evita montar string a cada chamada
+    _STATUS = ("Luz: DESLIGADA", "Luz: LIGADA")
+
+    def __init__(self):
+        self._on = False
+
+    def turn_on(self):
+        self._on = True
+
+    def turn_off(self):
+        self._on = False
+
+    def status(self) -> str:
+        return self._STATUS[self._on]
+
+
+class Camera(Device):
+    __slots__ = ("_recording",)
+    _STATUS = ("Câmera: DESLIGADA", "Câmera: Gravação")
+
+    def __init__(self):
+        self._recording = False
+
+    def turn_on(self):
+        self._recording = True
+
+    def turn_off(self):
+        self._recording = False
+
+    def status(self) -> str:
+        return self._STATUS[self._recording]
+
+    def security_action(self):
+        self.turn_on()
+
+
+class MotionSensor(Device):
+    __slots__ = ("_active",)
+    _STATUS = ("Sensor de movimento: DESLIGADO", "Sensor de Movimento: Ativo")
+
+    def __init__(self):
+        self._active = False
+
+    def turn_on(self):
+        self._active = True
+
+    def turn_off(self):
+        self._active = False
+
+    def status(self) -> str:
+        return self._STATUS[self._active]
+
+    def security_action(self):
+        self.turn_on()
+
+
+# Registro fixo de tipos, montado uma vez só (não recriado a cada create)
+_FACTORY = {
+    "light": Light,
+    "camera": Camera,
+    "sensor": MotionSensor
+}
+
+
+# Factory que cria objetos automaticamente
+class DeviceFactory:
+    @staticmethod
+    def create(device_type: str) -> Device:
+        cls = _FACTORY.get(device_type)
+        if cls is None:
+            raise ValueError(f"Tipo desconhecido: {device_type}")
+        return cls()
+
+    @staticmethod
+    def register(device_type: str, cls):
+        # Permite plugar novos tipos de dispositivo sem editar a factory
+        _FACTORY[device_type] = cls
+
+
+# OBSERVER – Notificações enviadas para vários observadores
+# Ele permite que vários objetos recebam notificações quando algo acontece no sistema
+
+# Evento imutável com formatação preguiçosa: a string só é montada se algum
+# observador realmente for exibi-la (eventos filtrados não pagam nada)
+@dataclass(slots=True, frozen=True)
+class Event:
+    kind: str
+    payload: tuple
+
+    def __str__(self):
+        return f"{self.kind}: {self.payload!r}"
+
+
+class Observer(ABC):
+    __slots__ = ()
+
+    @abstractmethod
+    def update(self, event):
+        pass
+
+
+class UserApp(Observer):
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def update(self, event):
+        # Formatação %s é adiada: só acontece se o log for mesmo emitido
+        logger.info("%s - APP received notification: %s", self.name, event)
+
+
+class Notifier:
+    __slots__ = ("_observers", "_snapshot")
+
+    def __init__(self):
+        # Dict mantém ordem de inserção, impede duplicata e remove em O(1)
+        # Cada observador tem um nível: só recebe eventos com nível igual ou maior
+        self._observers: dict = {}
+        # Cópia imutável refeita só em register/remove, evita copiar a lista a cada notify
+        self._snapshot: tuple = ()
+
+    def register(self, observer: Observer, level: int = 0):
+        self._observers[observer] = level
+        self._snapshot = tuple((lvl, obs) for obs, lvl in self._observers.items())
+
+    def remove(self, observer: Observer):
+        self._observers.pop(observer, None)
+        self._snapshot = tuple((lvl, obs) for obs, lvl in self._observers.items())
+
+    def notify(self, event, level: int = 0):
+        for obs_level, observer in self._snapshot:
+            if obs_level <= level:
+                observer.update(event)
+
+
+
+# STRATEGY – Modos de operação diferentes
+
+class OperationMode(ABC):
+    # Cacheia o nome da classe uma vez: evita __class__.__name__ no caminho quente
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._NAME = cls.__name__
+
+    @abstractmethod
+    def apply(self, devices: List[Device]):
+        pass
+
+    # Tabela de ação por tipo (definida nas subclasses): mapeia kind -> estado
+    _ACTION_TABLE = None
+
+    # Caminho vetorizado para frota em arrays (ver kernels acima)
+    def apply_bulk(self, state, kind):
+        raise NotImplementedError
+
+    def apply_table(self, table: "DeviceTable"):
+        # Sem branch por dispositivo: um gather + store vetorizado resolve tudo
+        n = table._count
+        table.state[:n] = self._ACTION_TABLE[table.kind[:n]]
+
+    async def apply_async(self, devices: List[Device]):
+        self.apply(devices)
+
+
+class EcoMode(OperationMode):
+    _ACTION_TABLE = np.array([0, 0, 0], dtype=np.uint8)
+
+    def apply(self, devices: List[Device]):
+        # add_device já garantiu que todo dispositivo tem turn_on/turn_off,
+        # então o laço dispensa o try/except por iteração
+        for device in devices:
+            device.turn_off()
+
+    async def apply_async(self, devices: List[Device]):
+        # Dispara tudo em paralelo: espera só a maior latência, não a soma
+        await asyncio.gather(*(device.turn_off_async() for device in devices))
+
+    def apply_bulk(self, state, kind):
+        _apply_eco_kernel(state, kind)
+
+
+class ComfortMode(OperationMode):
+    _ACTION_TABLE = np.array([1, 1, 1], dtype=np.uint8)
+
+    def apply(self, devices: List[Device]):
+        for device in devices:
+            device.turn_on()
+
+    async def apply_async(self, devices: List[Device]):
+        await asyncio.gather(*(device.turn_on_async() for device in devices))
+
+    def apply_bulk(self, state, kind):
+        _apply_comfort_kernel(state, kind)
+
+
+class SecurityMode(OperationMode):
+    # light -> desliga, camera e sensor -> ligam
+    _ACTION_TABLE = np.array([0, 1, 1], dtype=np.uint8)
+
+    def apply(self, devices: List[Device]):
+        for device in devices:
+            device.security_action()
+
+    async def apply_async(self, devices: List[Device]):
+        await asyncio.gather(*(device.security_action_async() for device in devices))
+
+    def apply_bulk(self, state, kind):
+        _apply_security_kernel(state, kind)
+
+
+# Kernels compilados pelo Numba para frotas grandes de dispositivos.
+# O estado vira arrays (SoA): state[i] = ligado/desligado, kind[i] = tipo
+# (0=light, 1=camera, 2=sensor). O laço compila para código nativo paralelo.
+
+@njit(parallel=True, cache=True)
+def _apply_eco_kernel(state, kind):
+    for i in prange(state.size):
+        state[i] = 0
+
+
+@njit(parallel=True, cache=True)
+def _apply_comfort_kernel(state, kind):
+    for i in prange(state.size):
+        state[i] = 1
+
+
+@njit(parallel=True, cache=True)
+def _apply_security_kernel(state, kind):
+    for i in prange(state.size):
+        state[i] = 1 if kind[i] != 0 else 0
+
+
+# SoA – frota de dispositivos em arrays contíguos.
+# No lugar de uma List[Device] (um objeto por aparelho, N ponteiros para
+# percorrer), a tabela guarda estado e tipo em dois arrays NumPy: modos e
+# consulta de status viram operações vetorizadas sobre memória contígua.
+
+_KIND_CODES = {"light": 0, "camera": 1, "sensor": 2}
+
+
+class DeviceTable:
+    __slots__ = ("state", "kind", "_count", "_status_table")
+
+    def __init__(self, capacity: int):
+        self.state = np.zeros(capacity, dtype=np.uint8)
+        self.kind = np.zeros(capacity, dtype=np.uint8)
+        self._count = 0
+        # Reaproveita as strings de status já pré-calculadas nas classes
+        self._status_table = np.array([Light._STATUS, Camera._STATUS, MotionSensor._STATUS])
+
+    def add(self, device_type: str) -> "TableDevice":
+        code = _KIND_CODES.get(device_type)
+        if code is None:
+            raise ValueError(f"Tipo desconhecido: {device_type}")
+        if self._count >= self.kind.size:
+            raise ValueError("Tabela de dispositivos cheia")
+        index = self._count
+        self.kind[index] = code
+        self._count += 1
+        return TableDevice(self, index)
+
+    def apply_mode(self, mode: OperationMode):
+        # Tabela branchless por padrão; os kernels Numba (apply_bulk) evitam
+        # o array temporário do gather quando a frota for realmente grande
+        mode.apply_table(self)
+
+    def status_all(self):
+        # Uma indexação vetorizada devolve o status de todos de uma vez
+        n = self._count
+        return self._status_table[self.kind[:n], self.state[:n]]
+
+
+# Dispositivo "handle": só guarda o índice, o estado mora nos arrays
+class TableDevice(Device):
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: DeviceTable, index: int):
+        self._table = table
+        self._index = index
+
+    def turn_on(self):
+        self._table.state[self._index] = 1
+
+    def turn_off(self):
+        self._table.state[self._index] = 0
+
+    def status(self) -> str:
+        table = self._table
+        return str(table._status_table[table.kind[self._index], table.state[self._index]])
+
+    def security_action(self):
+        table = self._table
+        table.state[self._index] = 1 if table.kind[self._index] != 0 else 0
+
+
+# Helpers para rotinas async: ações independentes rodam juntas,
+# ações dependentes (ex: ligar câmera antes de gravar) rodam em ordem
+async def run_sequence(*coros):
+    for coro in coros:
+        await coro
+
+
+async def run_parallel(*coros):
+    await asyncio.gather(*coros)
+
+
+# Construção de rotinas passo a passo
+
+# Gera no build uma função única com as chamadas em linha: executar a
+# rotina vira um call só, sem o laço interpretado sobre a lista de ações
+def _fuse_actions(actions: List[Callable]) -> Callable:
+    if not actions:
+        return lambda: None
+    lines = "\n".join(f"    _a{i}()" for i in range(len(actions)))
+    namespace = {f"_a{i}": action for i, action in enumerate(actions)}
+    exec(f"def _fused():\n{lines}", namespace)
+    return namespace["_fused"]
+
+
+class Routine:
+    def __init__(self, name: str, actions: List[Callable]):
+        self.name = name
+        self.actions = actions
+        self._fused = _fuse_actions(actions)
+
+    def execute(self):
+        self._fused()
+
+
+class RoutineBuilder:
+    def __init__(self):
+        self.name = "Routine"
+        self.actions = []
+
+    def with_name(self, name: str):
+        self.name = name
+        return self
+
+    def add_action(self, action: Callable):
+        self.actions.append(action)
+        return self
+
+    def build(self) -> Routine:
+        return Routine(self.name, self.actions)
+
+
+# FACADE – Interface simples para controlar o sistema
+
+class SmartHomeFacade:
+    def __init__(self, controller):
+        self._controller = controller
+
+    def activate_security_mode(self):
+        self._controller.set_mode(SecurityMode())
+
+    def activate_comfort_mode(self):
+        self._controller.set_mode(ComfortMode())
+
+    def execute_routine(self, routine: Routine):
+        routine.execute()
+
+    def turn_on_device(self, device: Device):
+        self._controller.execute_command(TurnOnCommand(device))
+
+    def turn_off_device(self, device: Device):
+        self._controller.execute_command(TurnOffCommand(device))
+
+
+
+#  Adiciona funcionalidades sem alterar a classe base
+
+class DeviceDecorator(Device):
+    __slots__ = ("_device",)
+
+    def __init__(self, device: Device):
+        self._device = device
+
+    def turn_on(self):
+        self._device.turn_on()
+
+    def turn_off(self):
+        self._device.turn_off()
+
+    def status(self):
+        return self._device.status()
+
+    def security_action(self):
+        self._device.security_action()
+
+
+class RemoteMonitoringDecorator(DeviceDecorator):
+    __slots__ = ("_notifier",)
+
+    def __init__(self, device: Device, notifier: Notifier):
+        super().__init__(device)
+        self._notifier = notifier
+
+    def turn_on(self):
+        super().turn_on()
+        self._notifier.notify(
+            Event("Remotely turned ON", (self._device._NAME,))
+        )
+
+    def turn_off(self):
+        super().turn_off()
+        self._notifier.notify(
+            Event("Remotely turned OFF", (self._device._NAME,))
+        )
+
+
+
+#Executar e desfazer ações
+
+class Command(ABC):
+    __slots__ = ()
+
+    # Cacheia o nome da classe uma vez: evita __class__.__name__ no caminho quente
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._NAME = cls.__name__
+
+    @abstractmethod
+    def execute(self):
+        pass
+
+    @abstractmethod
+    def undo(self):
+        pass
+
+
+class TurnOnCommand(Command):
+    __slots__ = ("_device",)
+
+    def __init__(self, device: Device):
+        self._device = device
+
+    def execute(self):
+        self._device.turn_on()
+
+    def undo(self):
+        self._device.turn_off()
+
+
+class TurnOffCommand(Command):
+    __slots__ = ("_device",)
+
+    def __init__(self, device: Device):
+        self._device = device
+
+    def execute(self):
+        self._device.turn_off()
+
+    def undo(self):
+        self._device.turn_on()
+
+
+# Despacho especializado por tipo de comando: para replay em massa, o dict
+# evita o dispatch abstrato de cmd.execute() e deixa o call site monomórfico
+_EXEC = {
+    TurnOnCommand: lambda cmd: cmd._device.turn_on(),
+    TurnOffCommand: lambda cmd: cmd._device.turn_off(),
+}
+
+
+# SINGLETON + DEPENDENCY INJECTION – Controlador central
+
+class CentralController:
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, notifier=None):
+        # Lock garante que só uma thread cria e inicializa a instância
+        with cls._lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._devices = []
+                # Pilha de undo limitada: casa longa rodando meses não acumula
+                # comandos sem fim (deque descarta os mais antigos sozinha)
+                instance._history = deque(maxlen=1024)
+                instance._mode = None
+                instance._notifier = notifier or Notifier()
+                cls._instance = instance
+        return cls._instance
+
+    def __init__(self, notifier=None):
+        # Inicialização completa acontece em __new__, uma única vez
+        pass
+
+    def add_device(self, device: Device):
+        # Checa a capacidade uma vez aqui, no registro, e não a cada modo
+        if not callable(getattr(device, "turn_on", None)) or not callable(getattr(device, "turn_off", None)):
+            raise TypeError(f"Dispositivo sem turn_on/turn_off: {device!r}")
+        self._devices.append(device)
+        # Evento de rotina (nível 1): observadores de nível 0 continuam recebendo tudo
+        self._notifier.notify(Event("Device added", (device._NAME,)), level=1)
+
+    def execute_command(self, command: Command):
+        handler = _EXEC.get(command.__class__)
+        if handler is not None:
+            handler(command)
+        else:
+            # Comandos fora da tabela (ex: plugados de fora) seguem o caminho normal
+            command.execute()
+        self._history.append(command)
+        # time.monotonic_ns() é bem mais barato que datetime.now() no caminho quente
+        self._notifier.notify(Event("Command executed", (command._NAME, time.monotonic_ns())))
+
+    def undo_last(self):
+        if not self._history:
+            return
+        cmd = self._history.pop()
+        cmd.undo()
+        self._notifier.notify(Event("Command undone", (cmd._NAME, time.monotonic_ns())))
+
+    def set_mode(self, mode: OperationMode):
+        self._mode = mode
+        if mode:
+            mode.apply(self._devices)
+            self._notifier.notify(Event("Mode set", (mode._NAME,)))
+
+    async def set_mode_async(self, mode: OperationMode):
+        self._mode = mode
+        if mode:
+            await mode.apply_async(self._devices)
+            self._notifier.notify(Event("Mode set", (mode._NAME,)))
+
+
+
+
+# delay=0 deixa a demo instantânea em testes/CI
+def main(delay: float = 2.5):
+    notifier = Notifier()
+    app = UserApp("Otavio")
+    notifier.register(app)
+
+    controller = CentralController(notifier=notifier)
+
+    l1 = DeviceFactory.create("light")
+    c1 = DeviceFactory.create("camera")
+    s1 = DeviceFactory.create("sensor")
+
+    for device in [l1, c1, s1,]:
+        controller.add_device(device)
+
+    facade = SmartHomeFacade(controller)
+
+    facade.activate_security_mode()
+
+    for device in controller._devices:
+        print(device.status())
+
+    # Uma pausa única no lugar do loop de sleeps: sem redesenhos de barra
+    tqdm.write("Aguardando...")
+    time.sleep(delay)
+
+    routine = (
+        RoutineBuilder()
+        .with_name("Boa noite")
+        .add_action(lambda: facade.turn_off_device(l1))
+        .add_action(lambda: facade.activate_comfort_mode())
+        .build()
+    )
+
+    facade.execute_routine(routine)
+
+    for device in controller._devices:
+        print(device.status())
+
+    tqdm.write("Aguardando...")
+    time.sleep(delay)
+
+    controller.undo_last()
+
+    print("Fim")
+
+
+if __name__ == "__main__":
+    main()